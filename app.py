@@ -3,12 +3,18 @@ Main application for the English conversation assistant.
 """
 
 import os
+import atexit
+import functools
 from dotenv import load_dotenv
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, render_template, request, jsonify, send_file, abort
 import base64
 from components.transcription import get_transcriber
 from components.generation import get_generator
+from components.generation.grammar_checker import GrammarChecker
 from components.synthesis import get_synthesizer
+from components.storage import get_store
+from components import single_flight, tiering
+from components.scheduler import Scheduler, Overloaded, INTERACTIVE, BACKGROUND
 from feedback import FeedbackSystem
 import config
 
@@ -22,15 +28,62 @@ if os.getenv("FEEDBACK_ENABLED", "false").lower() == "true":
 
 # Initialize components
 print("Initializing components...")
-transcriber = get_transcriber(config.MODEL_PROVIDER)
-generator = get_generator(config.MODEL_PROVIDER)
+scheduler = Scheduler(config.SCHEDULER_STAGES, config.SCHEDULER_DEADLINES)
+transcriber = get_transcriber(
+    config.MODEL_PROVIDER, load=lambda: scheduler.depth("transcription")
+)
+generator = get_generator(
+    config.MODEL_PROVIDER, load=lambda: scheduler.depth("generation")
+)
 synthesizer = get_synthesizer(config.MODEL_PROVIDER)
+store = get_store(config.DATABASE_PATH)
+grammar_checker = GrammarChecker()
+atexit.register(store.close)
 
-# Create an in-memory conversation history
-conversation = [{"role": "system", "content": config.SYSTEM_PROMPT}]
+# Run every model once so that no user pays for first-call initialization
+if config.WARM_UP:
+    print("Warming up components...")
+    transcriber.warm_up()
+    generator.warm_up()
+    synthesizer.warm_up()
 
-# AI is speaking flag
-speaking = False
+# Voice chosen by each learner, the configured voice is used otherwise
+learner_voices = {}
+
+# Recent turns of each learner, resumed from the persisted ones on first use
+conversations = {}
+
+
+def get_conversation(learner_id):
+    """Get the recent turns of a learner, loading them from the store if needed."""
+    if learner_id not in conversations:
+        conversations[learner_id] = store.recent_turns(
+            learner_id, config.HISTORY_TURNS
+        )
+    return conversations[learner_id]
+
+
+def get_learner_id(data):
+    """Get the learner identifier sent by the client, or the default one."""
+    learner_id = data.get("learner_id") or config.DEFAULT_LEARNER_ID
+    if not isinstance(learner_id, str) or len(learner_id) > 100:
+        abort(400, description="learner_id must be a string of up to 100 characters")
+    return learner_id
+
+
+@app.errorhandler(400)
+def handle_bad_request(error):
+    """Return bad request errors as JSON."""
+    return jsonify({"error": error.description}), 400
+
+
+@app.errorhandler(Overloaded)
+def handle_overloaded(error):
+    """Ask the client to retry later when a stage is overloaded."""
+    resp = jsonify({"error": str(error), "retry_after": error.retry_after})
+    resp.status_code = 429
+    resp.headers["Retry-After"] = str(error.retry_after)
+    return resp
 
 
 @app.route("/")
@@ -43,54 +96,95 @@ def index():
 def process_audio():
     """Process audio data and return AI response."""
     # Get audio data from request
+    learner_id = get_learner_id(request.json)
     audio_data = request.json.get("audio")
     audio_binary = base64.b64decode(audio_data.split(",")[1])
 
-    # Save audio to temporary file
-    temp_file = "temp_recording.wav"
-    with open(temp_file, "wb") as f:
-        f.write(audio_binary)
+    def transcribe():
+        # Save audio to temporary file
+        temp_file = "temp_recording.wav"
+        with open(temp_file, "wb") as f:
+            f.write(audio_binary)
+
+        # Transcribe audio, reading the results before the slot is released
+        text = transcriber.transcribe(temp_file)
+        words = transcriber.extract_words()
+        return text, words, transcriber.pronunciation_score
 
-    # Transcribe audio
-    text = transcriber.transcribe(temp_file)
-    words = transcriber.extract_words()
+    text, words, pronunciation_score = scheduler.run(
+        "transcription", INTERACTIVE, transcribe
+    )
+    store.add_transcription(learner_id, text, words, pronunciation_score)
 
     # Return transcription for display
-    return jsonify({"transcription": text, "words": words})
+    return jsonify(
+        {
+            "transcription": text,
+            "words": words,
+            "pronunciation_score": pronunciation_score,
+        }
+    )
 
 
 @app.route("/api/generate-response", methods=["POST"])
 def generate_response():
     """Generate AI response based on the transcription."""
-    global conversation
-
     # Get transcription data
     data = request.json
+    learner_id = get_learner_id(data)
     text = data.get("transcription")
     low_confidence_words = [
         word["word"] for word in transcriber.words if word["is_low_confidence"]
     ]
+    # Words recognized confidently but pronounced with hesitation
+    low_score_words = [
+        word["word"]
+        for word in transcriber.words
+        if not word["is_low_confidence"]
+        and word.get("pronunciation_score") is not None
+        and word["pronunciation_score"] < config.PRONUNCIATION_SCORE_THRESHOLD
+    ]
+    user_content = text
     if low_confidence_words:
-        user_content = f"{text}\nNote to the assistant: The following words were mispronounced and may have been mistranscribed: {', '.join(low_confidence_words)}"
-    else:
-        user_content = text
-
-    conversation.append({"role": "user", "content": user_content})
-
-    # Generate response
-    response = generator.generate_response(conversation)
+        user_content += f"\nNote to the assistant: The following words were mispronounced and may have been mistranscribed: {', '.join(low_confidence_words)}"
+    if low_score_words:
+        user_content += f"\nNote to the assistant: The user struggled to pronounce the following words: {', '.join(low_score_words)}"
+
+    user_message = {"role": "user", "content": user_content}
+    conversation = get_conversation(learner_id)
+
+    # Generate response from the learner's recent turns only
+    response = scheduler.run(
+        "generation",
+        INTERACTIVE,
+        generator.generate_response,
+        [{"role": "system", "content": config.SYSTEM_PROMPT}]
+        + conversation
+        + [user_message],
+    )
+    conversation.append(user_message)
     conversation.append({"role": "assistant", "content": response})
+    del conversation[: -config.HISTORY_TURNS]
+    store.add_turn(learner_id, "user", user_content)
+    store.add_turn(learner_id, "assistant", response)
     resp = jsonify({"response": response})
 
     # Synthesize speech
-    audio = synthesizer.generate_audio(response)
+    audio = scheduler.run(
+        "synthesis",
+        INTERACTIVE,
+        synthesizer.generate_audio,
+        response,
+        learner_voices.get(learner_id),
+        coalesce=True,
+    )
 
     @resp.call_on_close
     def on_close():
-        global speaking
-        speaking = True
-        synthesizer.speak(audio)
-        speaking = False
+        try:
+            scheduler.run("playback", INTERACTIVE, synthesizer.speak, audio)
+        except Overloaded as error:
+            print(f"Skipping response playback: {error}")
 
     return resp
 
@@ -125,17 +219,18 @@ def play_user_word():
 @app.route("/api/play-ai-word", methods=["POST"])
 def play_ai_word():
     """Synthesize and play a specific AI word."""
-    global speaking
-    if not speaking:
-        data = request.json
-        word = data.get("word")
-        audio = synthesizer.generate_audio(word)
-        speaking = True
-        synthesizer.speak(audio)
-        speaking = False
-        return jsonify({"success": True})
-    else:
-        return jsonify({"error": "AI is already speaking"}), 400
+    data = request.json
+    word = data.get("word")
+    audio = scheduler.run(
+        "synthesis",
+        BACKGROUND,
+        synthesizer.generate_audio,
+        word,
+        learner_voices.get(get_learner_id(data)),
+        coalesce=True,
+    )
+    scheduler.run("playback", BACKGROUND, synthesizer.speak, audio)
+    return jsonify({"success": True})
 
 
 @app.route("/api/get-word-definition", methods=["POST"])
@@ -144,7 +239,14 @@ def get_word_definition():
     data = request.json
     word = data.get("word")
     context = data.get("context")
-    definition = generator.generate_word_definition(word, context)
+    definition = scheduler.run(
+        "generation",
+        BACKGROUND,
+        generator.generate_word_definition,
+        word,
+        context,
+        coalesce=True,
+    )
     return jsonify({"definition": definition})
 
 
@@ -155,12 +257,68 @@ def rephrase_text():
     text = data.get("text")
     last_ai_response = data.get("last_ai_response")
 
-    # Generate rephrasing suggestion
-    result = generator.generate_rephrase(text, last_ai_response)
+    # Generate rephrasing suggestion, skipping the model for clean sentences
+    result = grammar_checker.rephrase(
+        functools.partial(
+            scheduler.run,
+            "generation",
+            BACKGROUND,
+            generator.generate_rephrase,
+            coalesce=True,
+        ),
+        text,
+        last_ai_response,
+    )
+    store.add_rephrase(get_learner_id(data), text, result)
 
     return jsonify(result)
 
 
+@app.route("/api/voices")
+def list_voices():
+    """List the preloaded voices."""
+    return jsonify({"voices": synthesizer.list_voices()})
+
+
+@app.route("/api/voice", methods=["POST"])
+def set_voice():
+    """Switch the learner to another preloaded voice."""
+    data = request.json
+    voice = data.get("voice")
+    if voice not in synthesizer.list_voices():
+        return jsonify({"error": f"Unknown voice: {voice}"}), 400
+    learner_voices[get_learner_id(data)] = voice
+    return jsonify({"success": True, "voice": voice})
+
+
+@app.route("/api/learner-history", methods=["POST"])
+def learner_history():
+    """Get the learner's recent mistakes and the vocabulary they have used."""
+    learner_id = get_learner_id(request.json)
+    return jsonify(
+        {
+            "recent_mistakes": store.recent_mistakes(
+                learner_id, config.RECENT_MISTAKES_LIMIT
+            ),
+            "vocabulary": store.vocabulary_seen(learner_id),
+        }
+    )
+
+
+@app.route("/api/metrics")
+def metrics():
+    """Get the pipeline metrics."""
+    return jsonify(
+        {
+            "grammar_check": grammar_checker.stats(),
+            "coalescing": single_flight.stats(),
+            "scheduler": scheduler.stats(),
+            "tiering": tiering.stats(),
+            "synthesis_cache": synthesizer.cache_stats(),
+        }
+    )
+
+
 @app.route("/temp_recording.wav")
 def serve_recording():
     """Serve the temporary recording file."""
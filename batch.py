@@ -0,0 +1,264 @@
+"""
+Offline batch processing of recorded learner sessions.
+
+Runs the transcription, word confidence and rephrasing pipeline over a directory
+or a manifest of audio files and appends one JSON line per file to the output.
+Files already present in the output are skipped, so an interrupted run resumes
+where it stopped.
+
+Transcription runs one file at a time in each worker process, since Whisper
+decodes a single audio stream per call. Rephrasing runs per sentence, like the
+live app does per utterance, in batched generation calls across files.
+
+Usage:
+    python batch.py recordings/ results.jsonl
+    python batch.py manifest.txt results.jsonl --workers 4 --parquet results.parquet
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+from components.transcription import get_transcriber
+from components.generation import get_generator
+from components.generation.grammar_checker import GrammarChecker
+import config
+
+# Transcriber of the current worker process
+transcriber = None
+
+
+def list_audio_files(source):
+    """
+    List the audio files of a directory or a manifest.
+
+    Args:
+        source (str): A directory, searched recursively, or a text file with one path per line
+
+    Returns:
+        list of str: The absolute audio file paths
+    """
+    if os.path.isdir(source):
+        return sorted(
+            os.path.abspath(os.path.join(root, name))
+            for root, _, names in os.walk(source)
+            for name in names
+            if os.path.splitext(name)[1].lower() in config.AUDIO_EXTENSIONS
+        )
+
+    # Paths in a manifest are relative to the manifest itself
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source) as manifest:
+        return [
+            os.path.abspath(os.path.join(base, line.strip()))
+            for line in manifest
+            if line.strip() and not line.startswith("#")
+        ]
+
+
+def load_processed_files(output_path):
+    """
+    Get the files already processed successfully in a previous run.
+
+    Args:
+        output_path (str): Path to the JSONL output
+
+    Returns:
+        set of str: The absolute processed file paths
+    """
+    processed = set()
+    if not os.path.exists(output_path):
+        return processed
+    with open(output_path) as output:
+        for line in output:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # line cut short by an interruption
+            if "error" not in result:
+                processed.add(os.path.abspath(result["file"]))
+    return processed
+
+
+def truncate_partial_line(output_path):
+    """
+    Remove the last line of the output if an interruption cut it short.
+
+    Args:
+        output_path (str): Path to the JSONL output
+    """
+    if not os.path.exists(output_path):
+        return
+    with open(output_path, "rb+") as output:
+        output.seek(0, os.SEEK_END)
+        size = output.tell()
+        if size == 0:
+            return
+        # Search backwards for the end of the last complete line
+        position = size
+        while position > 0:
+            chunk_start = max(position - 65536, 0)
+            output.seek(chunk_start)
+            chunk = output.read(position - chunk_start)
+            if position == size and chunk.endswith(b"\n"):
+                return
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                position = chunk_start + newline + 1
+                break
+            position = chunk_start
+        print(f"Removing {size - position} bytes of a partial result line")
+        output.truncate(position)
+
+
+def init_worker():
+    """Load the transcriber once per worker process."""
+    global transcriber
+    transcriber = get_transcriber(config.MODEL_PROVIDER)
+
+
+def transcribe_file(path):
+    """
+    Transcribe an audio file in a worker process.
+
+    Args:
+        path (str): Path to the audio file
+
+    Returns:
+        dict: The transcription, words and low confidence words, or the error
+    """
+    try:
+        text = transcriber.transcribe(path)
+        words = transcriber.extract_words()
+    except Exception as error:
+        return {"file": path, "error": str(error)}
+    return {
+        "file": path,
+        "transcription": text,
+        "words": words,
+        "low_confidence_words": [
+            word["word"] for word in words if word["is_low_confidence"]
+        ],
+        "pronunciation_score": transcriber.pronunciation_score,
+    }
+
+
+def split_sentences(text):
+    """Split a transcript into sentences on final punctuation."""
+    return [
+        sentence.strip()
+        for sentence in re.split(r"(?<=[.!?])\s+", text)
+        if sentence.strip()
+    ]
+
+
+def add_rephrasings(generator, grammar_checker, results, batch_size):
+    """
+    Add rephrasings for every sentence of a batch of transcriptions.
+
+    Sentences found clean skip the model once the pre-check is trusted.
+
+    Args:
+        generator (GeneratorBase): The generator used for batched rephrasing
+        grammar_checker (GrammarChecker): The pre-check
+        results (list of dict): Results returned by transcribe_file
+        batch_size (int): Sentences per generation batch
+    """
+    to_rephrase = []
+    for result in results:
+        if "error" in result:
+            continue
+        result["rephrasings"] = []
+        for sentence in split_sentences(result["transcription"]):
+            rephrasing = {"text": sentence, "needs_rephrasing": False}
+            result["rephrasings"].append(rephrasing)
+            decision = grammar_checker.decide(sentence)
+            if decision != "skip":
+                to_rephrase.append((rephrasing, decision))
+
+    generated = generator.generate_rephrase_batch(
+        [rephrasing["text"] for rephrasing, _ in to_rephrase], batch_size
+    )
+    for (rephrasing, decision), result in zip(to_rephrase, generated):
+        rephrasing.update(result)
+        if decision == "audit":
+            grammar_checker.record_audit(result)
+
+
+def write_results(output, results):
+    """Append results to the JSONL output and flush them to disk."""
+    for result in results:
+        output.write(json.dumps(result) + "\n")
+    output.flush()
+    os.fsync(output.fileno())
+
+
+def export_parquet(output_path, parquet_path):
+    """
+    Convert the JSONL output to a Parquet file.
+
+    Args:
+        output_path (str): Path to the JSONL output
+        parquet_path (str): Path to the Parquet file to write
+    """
+    try:
+        import pyarrow.json
+        import pyarrow.parquet
+    except ImportError:
+        raise SystemExit("Parquet export requires pyarrow: pip install pyarrow")
+    table = pyarrow.json.read_json(output_path)
+    pyarrow.parquet.write_table(table, parquet_path)
+
+
+def main():
+    """Run the batch pipeline."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("source", help="directory of audio files or manifest file")
+    parser.add_argument("output", help="JSONL file results are appended to")
+    parser.add_argument("--workers", type=int, default=config.BATCH_WORKERS)
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=config.BATCH_SIZE,
+        help="files per output batch and sentences per generation batch",
+    )
+    parser.add_argument("--parquet", help="also export the results to this Parquet file")
+    args = parser.parse_args()
+
+    truncate_partial_line(args.output)
+    processed = load_processed_files(args.output)
+    files = [path for path in list_audio_files(args.source) if path not in processed]
+    print(f"{len(files)} files to process, {len(processed)} already done")
+
+    # Start the workers before loading the language model in this process
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(args.workers, initializer=init_worker) as pool:
+        generator = get_generator(config.MODEL_PROVIDER)
+        grammar_checker = GrammarChecker()
+
+        with open(args.output, "a") as output:
+            batch = []
+            done = 0
+            for result in pool.imap_unordered(transcribe_file, files):
+                batch.append(result)
+                if len(batch) == args.batch_size:
+                    add_rephrasings(
+                        generator, grammar_checker, batch, args.batch_size
+                    )
+                    write_results(output, batch)
+                    done += len(batch)
+                    print(f"Processed {done}/{len(files)} files")
+                    batch = []
+            if batch:
+                add_rephrasings(generator, grammar_checker, batch, args.batch_size)
+                write_results(output, batch)
+                done += len(batch)
+                print(f"Processed {done}/{len(files)} files")
+
+    if args.parquet:
+        export_parquet(args.output, args.parquet)
+
+
+if __name__ == "__main__":
+    main()
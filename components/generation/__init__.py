@@ -4,19 +4,25 @@ Generation factory module.
 
 from components.generation.local_generator import LocalGenerator
 from components.generation.openai_generator import OpenAIGenerator
+from components.generation.tiered_generator import TieredGenerator
+import config
 
 
-def get_generator(model_provider="local"):
+def get_generator(model_provider="local", load=None):
     """
     Factory function to get the appropriate generator.
 
     Args:
         model_provider (str): The model provider to use.
+        load (callable, optional): Returns the current generation load, used to pick
+            a model tier when config.MODEL_TIERING is enabled.
 
     Returns:
         GeneratorBase: An instance of a generator.
     """
     if model_provider == "openai":
         return OpenAIGenerator()
+    elif config.MODEL_TIERING:
+        return TieredGenerator(config.MODEL_TIERS, load)
     else:
         return LocalGenerator()
@@ -4,6 +4,7 @@ Base class for response generation.
 
 from abc import ABC, abstractmethod
 import json
+import config
 
 
 class GeneratorBase(ABC):
@@ -53,6 +54,51 @@ class GeneratorBase(ABC):
         """
         pass
 
+    def warm_up(self):
+        """Run representative requests so that the first real one is not slower."""
+        pass
+
+    def generate_rephrase_batch(self, texts, batch_size=None):
+        """
+        Generate rephrasings for several texts, without conversation context.
+
+        Args:
+            texts (list of str): The texts to rephrase
+            batch_size (int, optional): Texts per batch, defaults to config.BATCH_SIZE
+
+        Returns:
+            list of dict: One rephrasing result per text, as returned by generate_rephrase
+        """
+        return [self.generate_rephrase(text) for text in texts]
+
+    def build_rephrase_prompt(self, text, last_ai_response=None):
+        """
+        Build the chat messages asking for a rephrasing.
+
+        Args:
+            text (str): The user's text to rephrase
+            last_ai_response (str, optional): The last AI response for context
+
+        Returns:
+            list of dict: Messages with 'role' and 'content' keys
+        """
+        system_content = config.REPHRASING_PROMPT
+        if last_ai_response:
+            system_content += (
+                f'\nHere is the last AI response for context: "{last_ai_response}"'
+            )
+
+        return [
+            {
+                "role": "system",
+                "content": system_content,
+            },
+            {
+                "role": "user",
+                "content": text,
+            },
+        ]
+
     def process_rephrase_response(self, response_text):
         """
         Process and parse rephrasing response in a robust way.
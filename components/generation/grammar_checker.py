@@ -0,0 +1,246 @@
+"""
+Rule-based grammar pre-check used to skip rephrasing requests for clean sentences.
+"""
+
+import random
+import re
+import threading
+import config
+
+# Short utterances known to be correct, matched on the normalized text
+KNOWN_GOOD_SENTENCES = frozenset(
+    [
+        "yes",
+        "no",
+        "yeah",
+        "okay",
+        "ok",
+        "sure",
+        "of course",
+        "maybe",
+        "hello",
+        "hi",
+        "hey",
+        "hi there",
+        "hello there",
+        "good morning",
+        "good afternoon",
+        "good evening",
+        "good night",
+        "goodbye",
+        "bye",
+        "see you",
+        "see you later",
+        "see you soon",
+        "thanks",
+        "thank you",
+        "thank you very much",
+        "thanks a lot",
+        "no thanks",
+        "no thank you",
+        "yes please",
+        "please",
+        "sorry",
+        "i'm sorry",
+        "excuse me",
+        "me too",
+        "me neither",
+        "i agree",
+        "i don't agree",
+        "i don't know",
+        "i'm not sure",
+        "i think so",
+        "i don't think so",
+        "i see",
+        "i understand",
+        "i don't understand",
+        "that's right",
+        "that's true",
+        "exactly",
+        "great",
+        "good",
+        "fine",
+        "i'm fine",
+        "i'm good",
+        "i'm fine thanks",
+        "i'm fine thank you",
+        "i'm good thanks",
+        "i'm good thank you",
+        "not bad",
+        "how are you",
+        "and you",
+        "what about you",
+        "what do you mean",
+        "can you repeat that",
+        "could you repeat that",
+        "can you repeat please",
+        "nice to meet you",
+        "let's go",
+        "why not",
+        "sounds good",
+        "that sounds good",
+        "that's great",
+        "that's interesting",
+        "really",
+    ]
+)
+
+# Patterns of common learner mistakes, matched on the normalized text
+MISTAKE_PATTERNS = [
+    re.compile(pattern)
+    for pattern in [
+        r"\b(\w+) \1\b",  # repeated word
+        r"\ba (?!uni|use|one|eu|us)[aeiou]",  # "a" before a vowel sound
+        r"\ban (?!h)[bcdfgjklmnpqrstvwxyz]",  # "an" before a consonant sound
+        r"^(he|she|it) (don't|do|have|are|were)\b",  # third person agreement
+        r"^(he|she|it) (go|like|want|need|know|think|live|work|say|make)\b",
+        r"\b(i|you|we|they) (doesn't|has|is)\b",
+        r"\b(you|we|they) was\b",
+        r"\bi are\b",
+        r"\bam (agree|disagree)\b",
+        r"\bmore (better|worse|easier|bigger|smaller)\b",
+        r"\b(didn't|did|does|doesn't|don't) \w+ed\b",  # past tense after auxiliary
+        r"\b(can|could|must|should|will|would) to\b",
+        r"\b(can|could|must|should|will|would) \w+(ed|s)\b",
+        r"\b(informations|advices|furnitures|peoples|homeworks)\b",
+        r"\bpeople (is|was|has)\b",
+        r"\b(since|for) \d+ (years|days|months) ago\b",
+        r"\bvery (like|love|want)\b",
+    ]
+]
+
+
+def normalize_sentence(text):
+    """Lowercase a sentence and remove its punctuation."""
+    text = text.lower().replace("’", "'")
+    return " ".join(re.sub(r"[^\w' ]", " ", text).split())
+
+
+class GrammarChecker:
+    """Class for deciding whether a short sentence can skip LLM rephrasing."""
+
+    def __init__(self):
+        """Initialize the checker and its counters."""
+        self.lock = threading.Lock()
+        self.checked = 0
+        self.skipped = 0
+        self.audited = 0
+        self.audit_agreements = 0
+
+    def is_clean(self, text):
+        """
+        Check whether a sentence looks free of mistakes.
+
+        Args:
+            text (str): The user's text
+
+        Returns:
+            bool: True if the sentence is a known-good utterance, or if it is short
+                and matches no known mistake pattern
+        """
+        normalized = normalize_sentence(text)
+        if normalized in KNOWN_GOOD_SENTENCES:
+            return True
+        if not normalized or len(normalized.split()) > config.GRAMMAR_CHECK_MAX_WORDS:
+            return False
+        return not any(pattern.search(normalized) for pattern in MISTAKE_PATTERNS)
+
+    def skip_enabled(self):
+        """
+        Check whether the pre-check has agreed with the language model often enough.
+
+        Sentences found clean are all sent to the language model and audited at
+        first, they only skip it once the measured agreement is high enough.
+
+        Until GRAMMAR_CHECK_MIN_AUDITS sentences have been audited, and as long as the
+        accuracy stays below GRAMMAR_CHECK_MIN_ACCURACY, every sentence goes to the model.
+
+        Returns:
+            bool: True if clean sentences may skip the language model
+        """
+        with self.lock:
+            return (
+                self.audited >= config.GRAMMAR_CHECK_MIN_AUDITS
+                and self.audit_agreements / self.audited
+                >= config.GRAMMAR_CHECK_MIN_ACCURACY
+            )
+
+    def decide(self, text):
+        """
+        Decide how a sentence should be rephrased.
+
+        Args:
+            text (str): The user's text
+
+        Returns:
+            str: 'skip' to answer without the model, 'audit' to call the model and
+                record its agreement with the pre-check with record_audit, or 'model'
+        """
+        decision = "model"
+        if self.is_clean(text):
+            audit = random.random() < config.GRAMMAR_CHECK_AUDIT_RATE
+            decision = "skip" if self.skip_enabled() and not audit else "audit"
+        with self.lock:
+            self.checked += 1
+            if decision == "skip":
+                self.skipped += 1
+        return decision
+
+    def record_audit(self, result):
+        """
+        Record the language model label of an audited sentence.
+
+        Args:
+            result (dict): The rephrasing result returned by the generator
+        """
+        with self.lock:
+            self.audited += 1
+            if not result.get("needs_rephrasing"):
+                self.audit_agreements += 1
+
+    def rephrase(self, generate_rephrase, text, last_ai_response=None):
+        """
+        Rephrase the user's text, skipping the language model for clean sentences.
+
+        Args:
+            generate_rephrase (callable): Generates the rephrasing with the language model,
+                called with the text and the last AI response
+            text (str): The user's text to rephrase
+            last_ai_response (str, optional): The last AI response for context
+
+        Returns:
+            dict: {
+                'needs_rephrasing': bool - whether the text needs rephrasing
+                'rephrased_text': str - the rephrased text (if needed)
+            }
+        """
+        decision = self.decide(text)
+        if decision == "skip":
+            return {"needs_rephrasing": False}
+
+        result = generate_rephrase(text, last_ai_response)
+        if decision == "audit":
+            self.record_audit(result)
+        return result
+
+    def stats(self):
+        """
+        Get the pre-check counters.
+
+        Returns:
+            dict: Number of checked, skipped and audited sentences, the skip rate, the
+                accuracy of the pre-check against the language model labels and whether
+                skipping is enabled
+        """
+        skip_enabled = self.skip_enabled()
+        with self.lock:
+            return {
+                "checked": self.checked,
+                "skipped": self.skipped,
+                "skip_rate": self.skipped / self.checked if self.checked else None,
+                "audited": self.audited,
+                "accuracy": (
+                    self.audit_agreements / self.audited if self.audited else None
+                ),
+                "skip_enabled": skip_enabled,
+            }
@@ -4,17 +4,25 @@ Local response generation using transformer models.
 
 import os
 import torch
-from transformers import pipeline
+from transformers import pipeline, LogitsProcessorList
 import config
+from components.single_flight import coalesced, normalize_text
 from components.generation.generator_base import GeneratorBase
+from components.generation.rephrase_constraint import RephraseSchema
 
 
 class LocalGenerator(GeneratorBase):
     """Class for generating responses using a local model."""
 
-    def __init__(self):
-        """Initialize the local language model."""
-        print(f"Loading local language model: {config.MODEL_ID}...")
+    def __init__(self, model_id=None):
+        """
+        Initialize the local language model.
+
+        Args:
+            model_id (str, optional): The Hugging Face model id, defaults to config.MODEL_ID
+        """
+        self.model_id = model_id or config.MODEL_ID
+        print(f"Loading local language model: {self.model_id}...")
         self.device = config.DEVICE
 
         # Determine appropriate dtype
@@ -31,13 +39,28 @@ class LocalGenerator(GeneratorBase):
         # Use pipeline for more efficient text generation
         self.pipe = pipeline(
             "text-generation",
-            model=config.MODEL_ID,
-            tokenizer=config.MODEL_ID,
+            model=self.model_id,
+            tokenizer=self.model_id,
             torch_dtype=self.torch_dtype,
             device_map="auto",
             token=os.getenv("HF_TOKEN"),
         )
 
+        # Constrain rephrasing outputs to valid JSON
+        self.rephrase_schema = RephraseSchema(
+            self.pipe.tokenizer, self.pipe.tokenizer.eos_token_id
+        )
+
+    def warm_up(self):
+        """Run a short chat turn and a rephrasing through the model."""
+        self.pipe(
+            [{"role": "user", "content": config.WARM_UP_PHRASE}],
+            max_new_tokens=8,
+            do_sample=False,
+            return_full_text=False,
+        )
+        self.generate_rephrase(config.WARM_UP_PHRASE)
+
     def generate_response(self, conversation):
         """
         Generate a response using the local language model.
@@ -60,6 +83,12 @@ class LocalGenerator(GeneratorBase):
         response_text = response[0]["generated_text"]
         return response_text
 
+    @coalesced(
+        lambda word, context: (
+            (normalize_text(word) or "").lower(),
+            normalize_text(context),
+        )
+    )
     def generate_word_definition(self, word, context):
         """
         Generate a definition for a word in its context.
@@ -95,6 +124,12 @@ class LocalGenerator(GeneratorBase):
         definition = response[0]["generated_text"]
         return definition.strip()
 
+    @coalesced(
+        lambda text, last_ai_response=None: (
+            normalize_text(text),
+            normalize_text(last_ai_response),
+        )
+    )
     def generate_rephrase(self, text, last_ai_response=None):
         """
         Generate a rephrased version of the user's text that is more grammatically correct.
@@ -109,22 +144,7 @@ class LocalGenerator(GeneratorBase):
                 'rephrased_text': str - the rephrased text (if needed)
             }
         """
-        system_content = config.REPHRASING_PROMPT
-        if last_ai_response:
-            system_content += (
-                f'\nHere is the last AI response for context: "{last_ai_response}"'
-            )
-
-        prompt = [
-            {
-                "role": "system",
-                "content": system_content,
-            },
-            {
-                "role": "user",
-                "content": text,
-            },
-        ]
+        prompt = self.build_rephrase_prompt(text, last_ai_response)
 
         response = self.pipe(
             prompt,
@@ -133,8 +153,56 @@ class LocalGenerator(GeneratorBase):
             top_p=config.TOP_P,
             do_sample=True,
             eos_token_id=self.pipe.tokenizer.eos_token_id,
+            logits_processor=LogitsProcessorList(
+                [self.rephrase_schema.logits_processor(config.MAX_NEW_TOKENS)]
+            ),
             return_full_text=False,
         )
 
         response_text = response[0]["generated_text"]
         return self.process_rephrase_response(response_text)
+
+    def generate_rephrase_batch(self, texts, batch_size=None):
+        """
+        Generate rephrasings for several texts in batched forward passes.
+
+        Args:
+            texts (list of str): The texts to rephrase
+            batch_size (int, optional): Texts per batch, defaults to config.BATCH_SIZE
+
+        Returns:
+            list of dict: One rephrasing result per text, as returned by generate_rephrase
+        """
+        if not texts:
+            return []
+
+        # Batched generation pads prompts on the left
+        tokenizer = self.pipe.tokenizer
+        if tokenizer.pad_token_id is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        tokenizer.padding_side = "left"
+
+        batch_size = batch_size or config.BATCH_SIZE
+        results = []
+        for start in range(0, len(texts), batch_size):
+            chunk = texts[start : start + batch_size]
+
+            # One logits processor per generate call, as it tracks the prompt length
+            responses = self.pipe(
+                [self.build_rephrase_prompt(text) for text in chunk],
+                batch_size=len(chunk),
+                max_new_tokens=config.MAX_NEW_TOKENS,
+                temperature=config.TEMPERATURE,
+                top_p=config.TOP_P,
+                do_sample=True,
+                eos_token_id=tokenizer.eos_token_id,
+                logits_processor=LogitsProcessorList(
+                    [self.rephrase_schema.logits_processor(config.MAX_NEW_TOKENS)]
+                ),
+                return_full_text=False,
+            )
+            results += [
+                self.process_rephrase_response(response[0]["generated_text"])
+                for response in responses
+            ]
+        return results
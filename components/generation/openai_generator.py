@@ -4,6 +4,7 @@ OpenAI response generation using the OpenAI API.
 
 from openai import OpenAI
 import config
+from components.single_flight import coalesced, normalize_text
 from components.generation.generator_base import GeneratorBase
 
 
@@ -32,6 +33,12 @@ class OpenAIGenerator(GeneratorBase):
         )
         return response.choices[0].message.content
 
+    @coalesced(
+        lambda word, context: (
+            (normalize_text(word) or "").lower(),
+            normalize_text(context),
+        )
+    )
     def generate_word_definition(self, word, context):
         """
         Generate a definition for a word in its context.
@@ -62,6 +69,12 @@ class OpenAIGenerator(GeneratorBase):
 
         return response.choices[0].message.content
 
+    @coalesced(
+        lambda text, last_ai_response=None: (
+            normalize_text(text),
+            normalize_text(last_ai_response),
+        )
+    )
     def generate_rephrase(self, text, last_ai_response=None):
         """
         Generate a rephrased version of the user's text that is more grammatically correct.
@@ -76,22 +89,7 @@ class OpenAIGenerator(GeneratorBase):
                 'rephrased_text': str - the rephrased text (if needed)
             }
         """
-        system_content = config.REPHRASING_PROMPT
-        if last_ai_response:
-            system_content += (
-                f'\nHere is the last AI response for context: "{last_ai_response}"'
-            )
-
-        prompt = [
-            {
-                "role": "system",
-                "content": system_content,
-            },
-            {
-                "role": "user",
-                "content": text,
-            },
-        ]
+        prompt = self.build_rephrase_prompt(text, last_ai_response)
 
         response = self.client.chat.completions.create(
             model=config.OPENAI_CHAT_MODEL,
@@ -0,0 +1,142 @@
+"""
+Constrained decoding of rephrasing responses for local models.
+"""
+
+import torch
+from transformers import LogitsProcessor
+
+# Fixed parts of the rephrasing JSON object
+PREFIX = '{"needs_rephrasing":'
+NO_REPHRASING = " false}"
+REPHRASING = ' true, "rephrased_text": "'
+CLOSING = '"}'
+
+# Characters that would need escaping inside a JSON string
+FORBIDDEN_STRING_CHARACTERS = set('"\\') | {chr(code) for code in range(32)}
+
+
+class RephraseSchema:
+    """Token-level description of the rephrasing JSON schema for a tokenizer."""
+
+    def __init__(self, tokenizer, eos_token_id):
+        """
+        Precompute the token sequences and masks used to constrain decoding.
+
+        Args:
+            tokenizer: The tokenizer of the local model
+            eos_token_id (int or list of int): The end of sequence token(s)
+        """
+
+        def encode(text):
+            return tokenizer.encode(text, add_special_tokens=False)
+
+        self.prefix_ids = encode(PREFIX)
+        self.no_rephrasing_ids = encode(NO_REPHRASING)
+        self.rephrasing_ids = encode(REPHRASING)
+        self.closing_ids = encode(CLOSING)
+        if isinstance(eos_token_id, list):
+            eos_token_id = eos_token_id[0]
+        self.eos_token_id = eos_token_id
+
+        # Tokens that can appear inside the rephrased text without escaping
+        vocabulary = tokenizer.batch_decode([[i] for i in range(len(tokenizer))])
+        self.string_token_mask = torch.tensor(
+            [
+                bool(token) and not FORBIDDEN_STRING_CHARACTERS.intersection(token)
+                for token in vocabulary
+            ],
+            dtype=torch.bool,
+        )
+        self.string_token_mask[tokenizer.all_special_ids] = False
+
+    def logits_processor(self, max_new_tokens):
+        """
+        Create a logits processor for a single generation call.
+
+        Args:
+            max_new_tokens (int): The generation budget, used to close the string in time
+
+        Returns:
+            RephraseLogitsProcessor: A fresh logits processor
+        """
+        return RephraseLogitsProcessor(self, max_new_tokens)
+
+
+class RephraseLogitsProcessor(LogitsProcessor):
+    """Logits processor that only allows tokens valid under the rephrasing schema."""
+
+    def __init__(self, schema, max_new_tokens):
+        """
+        Initialize the logits processor.
+
+        Args:
+            schema (RephraseSchema): The precomputed schema
+            max_new_tokens (int): The generation budget
+        """
+        self.schema = schema
+        self.max_new_tokens = max_new_tokens
+        self.prompt_length = None
+
+    def __call__(self, input_ids, scores):
+        """
+        Mask out every token that would make the response invalid.
+
+        Args:
+            input_ids (torch.LongTensor): Prompt and generated tokens
+            scores (torch.FloatTensor): Next token scores
+
+        Returns:
+            torch.FloatTensor: The masked scores
+        """
+        if self.prompt_length is None:
+            self.prompt_length = input_ids.shape[1]
+        if self.schema.string_token_mask.device != scores.device:
+            self.schema.string_token_mask = self.schema.string_token_mask.to(
+                scores.device
+            )
+
+        allowed = torch.zeros_like(scores, dtype=torch.bool)
+        for row, generated in enumerate(input_ids[:, self.prompt_length :].tolist()):
+            self._allow_next_tokens(allowed[row], generated)
+        return scores.masked_fill(~allowed, float("-inf"))
+
+    def _allow_next_tokens(self, allowed, generated):
+        """Mark the tokens allowed after the generated tokens of one sequence."""
+        schema = self.schema
+
+        # Opening of the object, then the choice between both branches
+        if len(generated) < len(schema.prefix_ids):
+            allowed[schema.prefix_ids[len(generated)]] = True
+            return
+        rest = generated[len(schema.prefix_ids) :]
+        if not rest:
+            allowed[schema.no_rephrasing_ids[0]] = True
+            allowed[schema.rephrasing_ids[0]] = True
+            return
+
+        if rest[0] == schema.no_rephrasing_ids[0]:
+            branch = schema.no_rephrasing_ids
+        else:
+            branch = schema.rephrasing_ids
+        if len(rest) < len(branch):
+            allowed[branch[len(rest)]] = True
+            return
+        if branch is schema.no_rephrasing_ids:
+            allowed[schema.eos_token_id] = True
+            return
+
+        # Stop right after the object closes
+        text = rest[len(branch) :]
+        if schema.closing_ids[0] in text:
+            closed = text[text.index(schema.closing_ids[0]) :]
+            if len(closed) < len(schema.closing_ids):
+                allowed[schema.closing_ids[len(closed)]] = True
+            else:
+                allowed[schema.eos_token_id] = True
+            return
+
+        # Inside the rephrased text, keeping enough budget to close the object
+        remaining = self.max_new_tokens - len(generated)
+        if remaining > len(schema.closing_ids) + 1:
+            allowed[: len(schema.string_token_mask)] = schema.string_token_mask
+        allowed[schema.closing_ids[0]] = True
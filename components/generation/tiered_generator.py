@@ -0,0 +1,85 @@
+"""
+Local response generation routed between several language models.
+"""
+
+from components.tiering import TierRouter
+from components.generation.generator_base import GeneratorBase
+from components.generation.local_generator import LocalGenerator
+
+
+class TieredGenerator(GeneratorBase):
+    """Class for generating responses with a model picked per request."""
+
+    def __init__(self, model_ids, load=None):
+        """
+        Load every language model.
+
+        Args:
+            model_ids (list of str): Model ids ordered from the smallest to the largest model
+            load (callable, optional): Returns the current generation load
+        """
+        self.generators = [LocalGenerator(model_id) for model_id in model_ids]
+        self.router = TierRouter("generation", model_ids, load)
+
+    def warm_up(self):
+        """Warm up every language model."""
+        for generator in self.generators:
+            generator.warm_up()
+
+    def generate_response(self, conversation):
+        """
+        Generate a chat reply, with the largest model the current load allows.
+
+        Args:
+            conversation (list of dict): List of conversation messages with 'role' and 'content' keys
+
+        Returns:
+            str: The generated response
+        """
+        index = self.router.choose("response", len(self.generators) - 1)
+        return self.generators[index].generate_response(conversation)
+
+    def generate_word_definition(self, word, context):
+        """
+        Generate a definition for a word in its context, with the smallest model.
+
+        Args:
+            word (str): The word to define
+            context (str): The context in which the word appears (the full AI response)
+
+        Returns:
+            str: A simplified definition of the word
+        """
+        index = self.router.choose("definition", 0)
+        return self.generators[index].generate_word_definition(word, context)
+
+    def generate_rephrase(self, text, last_ai_response=None):
+        """
+        Generate a rephrased version of the user's text, with the smallest model.
+
+        Args:
+            text (str): The user's text to rephrase
+            last_ai_response (str, optional): The last AI response for context
+
+        Returns:
+            dict: {
+                'needs_rephrasing': bool - whether the text needs rephrasing
+                'rephrased_text': str - the rephrased text (if needed)
+            }
+        """
+        index = self.router.choose("rephrase", 0)
+        return self.generators[index].generate_rephrase(text, last_ai_response)
+
+    def generate_rephrase_batch(self, texts, batch_size=None):
+        """
+        Generate rephrasings for several texts, with the smallest model.
+
+        Args:
+            texts (list of str): The texts to rephrase
+            batch_size (int, optional): Texts per batch, defaults to config.BATCH_SIZE
+
+        Returns:
+            list of dict: One rephrasing result per text, as returned by generate_rephrase
+        """
+        index = self.router.choose("rephrase", 0)
+        return self.generators[index].generate_rephrase_batch(texts, batch_size)
@@ -0,0 +1,263 @@
+"""
+Admission control and priority scheduling for the pipeline stages.
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from components import single_flight
+
+# Priority classes, lower values are served first
+INTERACTIVE = 0
+BACKGROUND = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+
+class Overloaded(Exception):
+    """Raised when a request is rejected or shed by the scheduler."""
+
+    def __init__(self, stage, retry_after):
+        """
+        Initialize the exception.
+
+        Args:
+            stage (str): The name of the overloaded stage
+            retry_after (int): Suggested number of seconds before retrying
+        """
+        super().__init__(f"The {stage} stage is overloaded")
+        self.stage = stage
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """A request waiting for a slot in a stage."""
+
+    def __init__(self, priority, deadline):
+        """Initialize the ticket."""
+        self.priority = priority
+        self.deadline = deadline
+        self.shed = False
+
+
+class Stage:
+    """Class for bounding the concurrency and the queue of a pipeline stage."""
+
+    def __init__(self, name, concurrency, queue_size):
+        """
+        Initialize the stage.
+
+        Args:
+            name (str): The name of the stage
+            concurrency (int): Maximum number of requests running at once
+            queue_size (int): Maximum number of requests waiting for a slot
+        """
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.condition = threading.Condition()
+        self.waiting = []  # heap of (priority, sequence, ticket)
+        self.sequence = itertools.count()
+        self.running = 0
+
+        # Metrics
+        self.admitted = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.rejected = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.shed = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.completed = 0
+        self.total_wait = 0.0
+        self.total_service = 0.0
+
+    def average_service_time(self):
+        """Average time spent running a request, in seconds."""
+        return self.total_service / self.completed if self.completed else 0.0
+
+    def expected_wait(self, ahead):
+        """Estimated time before a request with the given number of requests ahead can run."""
+        backlog = self.running + ahead - self.concurrency + 1
+        return max(backlog, 0) * self.average_service_time() / self.concurrency
+
+    def retry_after(self):
+        """Suggested number of seconds before retrying a rejected request."""
+        return max(1, math.ceil(self.expected_wait(len(self.waiting))))
+
+    def run(self, priority, timeout, function, *args):
+        """
+        Run a function once a slot is available.
+
+        Args:
+            priority (int): The priority class of the request
+            timeout (float): Maximum time to wait for a slot, in seconds
+            function (callable): The function to run
+            *args: Arguments passed to the function
+
+        Returns:
+            The result of the function
+
+        Raises:
+            Overloaded: If the queue is full or the deadline passes before a slot frees up
+        """
+        priority_name = PRIORITY_NAMES[priority]
+        enqueued_at = time.monotonic()
+
+        with self.condition:
+            ahead = sum(1 for entry in self.waiting if entry[0] <= priority)
+            if self.expected_wait(ahead) > timeout:
+                self.rejected[priority_name] += 1
+                raise Overloaded(self.name, self.retry_after())
+
+            if len(self.waiting) >= self.queue_size and (
+                self.running >= self.concurrency or self.waiting
+            ):
+                # Make room by shedding the newest request of a lower priority
+                victim = max(self.waiting, default=None)
+                if victim is None or victim[0] <= priority:
+                    self.rejected[priority_name] += 1
+                    raise Overloaded(self.name, self.retry_after())
+                self.waiting.remove(victim)
+                heapq.heapify(self.waiting)
+                victim[2].shed = True
+                self.condition.notify_all()
+
+            ticket = Ticket(priority, enqueued_at + timeout)
+            entry = (priority, next(self.sequence), ticket)
+            heapq.heappush(self.waiting, entry)
+            while True:
+                if ticket.shed:
+                    self.shed[priority_name] += 1
+                    raise Overloaded(self.name, self.retry_after())
+                if self.waiting[0] is entry and self.running < self.concurrency:
+                    heapq.heappop(self.waiting)
+                    self.running += 1
+                    break
+                remaining = ticket.deadline - time.monotonic()
+                if remaining <= 0:
+                    # Deadline passed while waiting, drop the request
+                    self.waiting.remove(entry)
+                    heapq.heapify(self.waiting)
+                    self.shed[priority_name] += 1
+                    self.condition.notify_all()
+                    raise Overloaded(self.name, self.retry_after())
+                self.condition.wait(remaining)
+
+            self.admitted[priority_name] += 1
+            self.total_wait += time.monotonic() - enqueued_at
+            # Let the next request check whether a slot is still free
+            self.condition.notify_all()
+
+        started_at = time.monotonic()
+        try:
+            return function(*args)
+        finally:
+            with self.condition:
+                self.running -= 1
+                self.completed += 1
+                self.total_service += time.monotonic() - started_at
+                self.condition.notify_all()
+
+    def stats(self):
+        """
+        Get the stage metrics.
+
+        Returns:
+            dict: Queue depth, running requests, counters and average times
+        """
+        with self.condition:
+            admitted = sum(self.admitted.values())
+            return {
+                "queue_depth": len(self.waiting),
+                "running": self.running,
+                "concurrency": self.concurrency,
+                "queue_size": self.queue_size,
+                "admitted": dict(self.admitted),
+                "rejected": dict(self.rejected),
+                "shed": dict(self.shed),
+                "completed": self.completed,
+                "average_wait": self.total_wait / admitted if admitted else 0.0,
+                "average_service": self.average_service_time(),
+            }
+
+
+class Scheduler:
+    """Class for routing requests through the bounded pipeline stages."""
+
+    def __init__(self, stages, deadlines):
+        """
+        Initialize the scheduler.
+
+        Args:
+            stages (dict): Stage settings by name, with 'concurrency' and 'queue_size' keys
+            deadlines (dict): Maximum waiting time in seconds by priority class
+        """
+        self.stages = {
+            name: Stage(name, settings["concurrency"], settings["queue_size"])
+            for name, settings in stages.items()
+        }
+        self.deadlines = deadlines
+
+        # Identical requests are coalesced before admission, so that only the
+        # first one takes a slot in the stage queue
+        self.flights = {name: single_flight.SingleFlight() for name in self.stages}
+
+    def run(self, stage, priority, function, *args, coalesce=False):
+        """
+        Run a function in a stage with the given priority.
+
+        Args:
+            stage (str): The name of the stage
+            priority (int): The priority class of the request
+            function (callable): The function to run
+            *args: Arguments passed to the function, hashable when coalescing
+            coalesce (bool, optional): Whether concurrent identical calls share the
+                result of the first one instead of being queued again
+
+        Returns:
+            The result of the function
+
+        Raises:
+            Overloaded: If the request is rejected or shed
+        """
+
+        def run_in_stage():
+            return self.stages[stage].run(
+                priority, self.deadlines[priority], function, *args
+            )
+
+        if not coalesce:
+            return run_in_stage()
+        key = (id(getattr(function, "__self__", None)), function.__name__) + tuple(
+            single_flight.normalize_text(arg) if isinstance(arg, str) else arg
+            for arg in args
+        )
+        return self.flights[stage].run(key, run_in_stage)
+
+    def depth(self, stage):
+        """
+        Get the number of requests waiting or running in a stage.
+
+        Args:
+            stage (str): The name of the stage
+
+        Returns:
+            int: The current load of the stage
+        """
+        stage = self.stages[stage]
+        with stage.condition:
+            return len(stage.waiting) + stage.running
+
+    def stats(self):
+        """
+        Get the metrics of every stage.
+
+        The 'coalescing' counters of a stage count the requests sharing the result
+        of an identical request before admission. In the web app most duplicates
+        are caught there rather than by the coalesced methods.
+
+        Returns:
+            dict: Stage metrics by stage name
+        """
+        return {
+            name: dict(stage.stats(), coalescing=self.flights[name].stats())
+            for name, stage in self.stages.items()
+        }
@@ -0,0 +1,128 @@
+"""
+Coalescing of identical concurrent calls into a single computation.
+"""
+
+import functools
+import threading
+
+# Single-flight groups of the decorated methods, by qualified name
+flights = {}
+
+
+class Call:
+    """An in-flight computation shared by every caller with the same key."""
+
+    def __init__(self):
+        """Initialize the call."""
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Class for sharing one in-flight computation between identical calls."""
+
+    def __init__(self):
+        """Initialize the group and its counters."""
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def run(self, key, function):
+        """
+        Run a function, or wait for the identical call already in flight.
+
+        Args:
+            key (tuple): The normalized arguments identifying the call
+            function (callable): The computation to run if no identical call is in flight
+
+        Returns:
+            The result of the computation
+        """
+        with self.lock:
+            self.calls += 1
+            call = self.in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = Call()
+                self.in_flight[key] = call
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        """
+        Get the coalescing counters.
+
+        Returns:
+            dict: Number of calls, executed computations, coalesced calls and calls in flight
+        """
+        with self.lock:
+            return {
+                "calls": self.calls,
+                "executed": self.calls - self.coalesced,
+                "coalesced": self.coalesced,
+                "in_flight": len(self.in_flight),
+            }
+
+
+def coalesced(normalize):
+    """
+    Decorator sharing one computation between concurrent identical method calls.
+
+    Args:
+        normalize (callable): Maps the method arguments to a hashable tuple
+
+    Returns:
+        callable: The decorator
+    """
+
+    def decorator(method):
+        flight = SingleFlight()
+        flights[method.__qualname__] = flight
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (id(self),) + normalize(*args, **kwargs)
+            return flight.run(key, lambda: method(self, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+def normalize_text(text):
+    """Collapse whitespace so that equivalent texts share the same key."""
+    return " ".join(text.split()) if text else text
+
+
+def stats():
+    """
+    Get the coalescing counters of every decorated method.
+
+    These count the calls reaching the methods themselves, such as identical
+    requests admitted by the scheduler at the same time or direct calls from
+    other callers. Requests coalesced before admission are counted by the
+    scheduler stage metrics instead.
+
+    Returns:
+        dict: Counters by method qualified name
+    """
+    return {name: flight.stats() for name, flight in flights.items()}
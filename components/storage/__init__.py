@@ -0,0 +1,18 @@
+"""
+Storage factory module.
+"""
+
+from components.storage.conversation_store import ConversationStore
+
+
+def get_store(database_path):
+    """
+    Factory function to get the conversation store.
+
+    Args:
+        database_path (str): Path to the SQLite database file.
+
+    Returns:
+        ConversationStore: An instance of the conversation store.
+    """
+    return ConversationStore(database_path)
@@ -0,0 +1,273 @@
+"""
+Persistent learner history stored in a local SQLite database.
+"""
+
+import queue
+import sqlite3
+from contextlib import closing
+import threading
+import time
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS turns (
+    id INTEGER PRIMARY KEY,
+    learner_id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transcriptions (
+    id INTEGER PRIMARY KEY,
+    learner_id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    pronunciation_score REAL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY,
+    learner_id TEXT NOT NULL,
+    word TEXT NOT NULL,
+    confidence REAL,
+    pronunciation_score REAL,
+    is_low_confidence INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rephrases (
+    id INTEGER PRIMARY KEY,
+    learner_id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    needs_rephrasing INTEGER NOT NULL,
+    rephrased_text TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_turns_learner ON turns (learner_id, id);
+CREATE INDEX IF NOT EXISTS idx_words_mistakes
+    ON words (learner_id, is_low_confidence, created_at);
+CREATE INDEX IF NOT EXISTS idx_words_vocabulary ON words (learner_id, word);
+CREATE INDEX IF NOT EXISTS idx_rephrases_mistakes
+    ON rephrases (learner_id, needs_rephrasing, created_at);
+"""
+
+
+class ConversationStore:
+    """Class for persisting conversations and learner mistakes without blocking requests."""
+
+    def __init__(self, database_path):
+        """
+        Open the database and start the background writer.
+
+        Args:
+            database_path (str): Path to the SQLite database file
+        """
+        self.database_path = database_path
+        with closing(self._connect()) as connection, connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+
+        # Writes are queued and committed in batches by a single writer thread
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+
+    def _connect(self):
+        """Open a new connection to the database."""
+        return sqlite3.connect(self.database_path, timeout=30)
+
+    def _write_loop(self):
+        """Commit queued writes in batches until the store is closed."""
+        connection = self._connect()
+        stopping = False
+        while not stopping:
+            batch = [self.pending.get()]
+            deadline = time.monotonic() + config.STORE_FLUSH_INTERVAL
+            while len(batch) < config.STORE_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.pending.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            # Events are flush requests and None marks the end of the stream
+            writes = [item for item in batch if isinstance(item, tuple)]
+            try:
+                with connection:
+                    for statement, rows in writes:
+                        connection.executemany(statement, rows)
+            except sqlite3.Error as error:
+                # Retry one write at a time so that only the failing ones are lost
+                print(f"Error writing learner history batch: {error}")
+                for statement, rows in writes:
+                    try:
+                        with connection:
+                            connection.executemany(statement, rows)
+                    except sqlite3.Error as error:
+                        print(f"Dropping learner history write: {error}")
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+                elif item is None:
+                    stopping = True
+        connection.close()
+
+    def _enqueue(self, statement, rows):
+        """Queue rows to be written by the background writer."""
+        if rows:
+            self.pending.put((statement, rows))
+
+    def add_turn(self, learner_id, role, content):
+        """
+        Record a conversation turn.
+
+        Args:
+            learner_id (str): The learner identifier
+            role (str): The message role ('user' or 'assistant')
+            content (str): The message content
+        """
+        self._enqueue(
+            "INSERT INTO turns (learner_id, role, content, created_at) VALUES (?, ?, ?, ?)",
+            [(learner_id, role, content, time.time())],
+        )
+
+    def add_transcription(self, learner_id, text, words, pronunciation_score=None):
+        """
+        Record a transcription with its word confidences.
+
+        Args:
+            learner_id (str): The learner identifier
+            text (str): The transcribed text
+            words (list of dict): Words returned by the transcriber
+            pronunciation_score (float, optional): The utterance pronunciation score
+        """
+        created_at = time.time()
+        self._enqueue(
+            "INSERT INTO transcriptions (learner_id, text, pronunciation_score, created_at) VALUES (?, ?, ?, ?)",
+            [(learner_id, text, pronunciation_score, created_at)],
+        )
+        self._enqueue(
+            "INSERT INTO words (learner_id, word, confidence, pronunciation_score, is_low_confidence, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    learner_id,
+                    normalize_word(word["word"]),
+                    word["confidence"],
+                    word.get("pronunciation_score"),
+                    int(word["is_low_confidence"]),
+                    created_at,
+                )
+                for word in words
+                if normalize_word(word["word"])
+            ],
+        )
+
+    def add_rephrase(self, learner_id, text, result):
+        """
+        Record a rephrasing result.
+
+        Args:
+            learner_id (str): The learner identifier
+            text (str): The user's text
+            result (dict): The rephrasing result returned by the generator
+        """
+        self._enqueue(
+            "INSERT INTO rephrases (learner_id, text, needs_rephrasing, rephrased_text, created_at) VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    learner_id,
+                    text,
+                    int(bool(result.get("needs_rephrasing"))),
+                    result.get("rephrased_text"),
+                    time.time(),
+                )
+            ],
+        )
+
+    def recent_turns(self, learner_id, limit):
+        """
+        Get the most recent conversation turns of a learner.
+
+        Args:
+            learner_id (str): The learner identifier
+            limit (int): Maximum number of turns to return
+
+        Returns:
+            list of dict: Messages with 'role' and 'content' keys, oldest first
+        """
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT role, content FROM turns WHERE learner_id = ? ORDER BY id DESC LIMIT ?",
+                (learner_id, limit),
+            ).fetchall()
+        return [{"role": role, "content": content} for role, content in reversed(rows)]
+
+    def recent_mistakes(self, learner_id, limit):
+        """
+        Get the learner's most recent mispronounced words and rephrased sentences.
+
+        Args:
+            learner_id (str): The learner identifier
+            limit (int): Maximum number of entries of each kind to return
+
+        Returns:
+            dict: {
+                'mispronounced_words': list of dict - words with their mistake count
+                'rephrasings': list of dict - original and rephrased texts
+            }
+        """
+        with closing(self._connect()) as connection:
+            words = connection.execute(
+                "SELECT word, COUNT(*), MAX(created_at) AS last_seen FROM words "
+                "WHERE learner_id = ? AND is_low_confidence = 1 "
+                "GROUP BY word ORDER BY last_seen DESC LIMIT ?",
+                (learner_id, limit),
+            ).fetchall()
+            rephrasings = connection.execute(
+                "SELECT text, rephrased_text FROM rephrases "
+                "WHERE learner_id = ? AND needs_rephrasing = 1 "
+                "ORDER BY created_at DESC LIMIT ?",
+                (learner_id, limit),
+            ).fetchall()
+        return {
+            "mispronounced_words": [
+                {"word": word, "count": count} for word, count, _ in words
+            ],
+            "rephrasings": [
+                {"text": text, "rephrased_text": rephrased_text}
+                for text, rephrased_text in rephrasings
+            ],
+        }
+
+    def vocabulary_seen(self, learner_id):
+        """
+        Get every word the learner has used, with the number of times it was used.
+
+        Args:
+            learner_id (str): The learner identifier
+
+        Returns:
+            dict: Mapping of word to usage count
+        """
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT word, COUNT(*) FROM words WHERE learner_id = ? GROUP BY word",
+                (learner_id,),
+            ).fetchall()
+        return dict(rows)
+
+    def flush(self):
+        """Block until every queued write has been committed."""
+        done = threading.Event()
+        self.pending.put(done)
+        done.wait()
+
+    def close(self):
+        """Commit queued writes and stop the background writer."""
+        self.pending.put(None)
+        self.writer.join()
+
+
+def normalize_word(word):
+    """Normalize a transcribed word for vocabulary lookups."""
+    return word.strip(" .,!?;:\"()-").lower()
@@ -0,0 +1,218 @@
+"""
+Phoneme caches for Kokoro's English grapheme-to-phoneme conversion.
+"""
+
+import copy
+import json
+import os
+import threading
+from collections import OrderedDict
+import config
+
+
+class LRUCache:
+    """Class for a bounded, thread-safe least recently used cache."""
+
+    def __init__(self, max_size):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size (int): Maximum number of entries kept
+        """
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Look up an entry, marking it as recently used.
+
+        Args:
+            key: The entry key
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """
+        Add an entry, evicting the least recently used ones beyond max_size.
+
+        Args:
+            key: The entry key
+            value: The value to cache
+        """
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        """
+        Get the cache counters.
+
+        Returns:
+            dict: Number of hits, misses and cached entries
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "cached": len(self.entries),
+            }
+
+
+class CachedG2P:
+    """A misaki G2P whose results for exact input texts are cached."""
+
+    def __init__(self, cache, g2p):
+        """
+        Initialize the wrapper.
+
+        Args:
+            cache (LRUCache): The cache of converted texts
+            g2p (callable): The misaki G2P used by the Kokoro pipeline
+        """
+        self.cache = cache
+        self.g2p = g2p
+
+    def __call__(self, text, *args, **kwargs):
+        """Convert a text, skipping tokenization and tagging for repeated texts."""
+        key = (text,) + args + tuple(sorted(kwargs.items()))
+        result = self.cache.get(key)
+        if result is None:
+            result = self.g2p(text, *args, **kwargs)
+            self.cache.put(key, result)
+        # The pipeline sets timestamps on the returned tokens
+        return copy.deepcopy(result)
+
+    def __getattr__(self, name):
+        """Expose the other attributes of the wrapped G2P."""
+        if name == "g2p":
+            raise AttributeError(name)
+        return getattr(self.g2p, name)
+
+
+class CachedFallback:
+    """A misaki fallback whose phonemes are cached per word and part-of-speech tag."""
+
+    def __init__(self, cache, fallback):
+        """
+        Initialize the wrapper.
+
+        Args:
+            cache (G2PCache): The cache holding the lexicon of converted tokens
+            fallback (callable): Returns phonemes and a rating for an unknown token
+        """
+        self.cache = cache
+        self.fallback = fallback
+
+    def __call__(self, token):
+        """Get the phonemes and rating of a token, converting it only on a cache miss."""
+        key = (token.text, token.tag)
+        entry = self.cache.tokens.get(key)
+        if entry is None:
+            entry = tuple(self.fallback(token))
+            self.cache.add_token(key, entry)
+        return entry
+
+    def __getattr__(self, name):
+        """Expose the other attributes of the wrapped fallback."""
+        if name == "fallback":
+            raise AttributeError(name)
+        return getattr(self.fallback, name)
+
+
+class G2PCache:
+    """Class for caching G2P results by exact text and fallback phonemes by token."""
+
+    def __init__(self, text_cache_size, token_cache_size, lexicon_path=None):
+        """
+        Initialize the caches and load the lexicon saved by previous runs.
+
+        Args:
+            text_cache_size (int): Maximum number of converted texts kept in memory
+            token_cache_size (int): Maximum number of fallback tokens kept in memory
+                and in the lexicon
+            lexicon_path (str, optional): Path of the JSON lexicon
+        """
+        self.texts = LRUCache(text_cache_size)
+        self.tokens = LRUCache(token_cache_size)
+        self.lexicon_path = lexicon_path
+        self.save_lock = threading.Lock()
+        self.unsaved = 0
+
+        if lexicon_path and os.path.exists(lexicon_path):
+            with open(lexicon_path) as f:
+                for text, tag, phonemes, rating in json.load(f):
+                    self.tokens.put((text, tag), (phonemes, rating))
+            print(f"Loaded {len(self.tokens.entries)} G2P lexicon entries")
+
+    def wrap(self, g2p):
+        """
+        Route the conversions of a misaki G2P through the caches.
+
+        Only the fallback is cached per token, since the lexicon lookups it
+        replaces are already dictionary lookups.
+
+        Args:
+            g2p: The misaki G2P used by the Kokoro pipeline
+
+        Returns:
+            CachedG2P: The G2P to use in the pipeline instead
+        """
+        if getattr(g2p, "fallback", None) is not None:
+            g2p.fallback = CachedFallback(self, g2p.fallback)
+        return CachedG2P(self.texts, g2p)
+
+    def add_token(self, key, entry):
+        """
+        Add a converted token, saving the lexicon every G2P_SAVE_EVERY new tokens.
+
+        Args:
+            key (tuple): The token text and part-of-speech tag
+            entry (tuple): The phonemes and rating
+        """
+        self.tokens.put(key, entry)
+        with self.save_lock:
+            self.unsaved += 1
+            save = self.unsaved >= config.G2P_SAVE_EVERY
+        if save:
+            self.save()
+
+    def save(self):
+        """Write the cached tokens to the lexicon, least recently used first."""
+        if not self.lexicon_path:
+            return
+        with self.tokens.lock:
+            entries = [
+                [text, tag, phonemes, rating]
+                for (text, tag), (phonemes, rating) in self.tokens.entries.items()
+            ]
+        with self.save_lock:
+            self.unsaved = 0
+            temp_path = f"{self.lexicon_path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(entries, f)
+            os.replace(temp_path, self.lexicon_path)
+
+    def stats(self):
+        """
+        Get the cache counters.
+
+        Returns:
+            dict: Counters of the text and token caches
+        """
+        return {"texts": self.texts.stats(), "tokens": self.tokens.stats()}
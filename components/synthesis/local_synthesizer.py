@@ -2,9 +2,12 @@
 Local speech synthesis module using Kokoro TTS.
 """
 
+import atexit
 import numpy as np
 from kokoro import KPipeline
 import config
+from components.single_flight import coalesced, normalize_text
+from components.synthesis.g2p_cache import G2PCache
 from components.synthesis.synthesizer_base import SynthesizerBase
 
 
@@ -13,21 +16,44 @@ class LocalSynthesizer(SynthesizerBase):
 
     def __init__(self):
         """Initialize the local TTS engine."""
+        super().__init__()
         print("Loading local TTS model...")
         self.tts_pipeline = KPipeline(lang_code="a")
 
-    def generate_audio(self, text):
+        # Reuse the conversion of repeated texts and of out-of-lexicon words
+        # already converted, in this run or a previous one
+        self.g2p_cache = G2PCache(
+            config.G2P_TEXT_CACHE_SIZE, config.G2P_CACHE_SIZE, config.G2P_LEXICON_PATH
+        )
+        self.tts_pipeline.g2p = self.g2p_cache.wrap(self.tts_pipeline.g2p)
+        atexit.register(self.g2p_cache.save)
+
+        # Load the voice packs once and keep them on the model device
+        device = self.tts_pipeline.model.device
+        for voice in config.TTS_VOICES:
+            pack = self.tts_pipeline.load_voice(voice)
+            self.voices[voice] = pack.to(device)
+            if self.voices[voice] is not pack:
+                # Drop the host copy cached by the pipeline
+                self.tts_pipeline.voices.pop(voice, None)
+
+    @coalesced(lambda text, voice=None: (normalize_text(text), voice))
+    def generate_audio(self, text, voice=None):
         """
         Convert text to speech using local Kokoro TTS.
 
         Args:
             text (str): The text to convert to speech
+            voice (str, optional): One of the preloaded voices, defaults to config.TTS_VOICE
 
         Returns:
             numpy.ndarray: The audio data
         """
         generator = self.tts_pipeline(
-            text, voice=config.TTS_VOICE, speed=config.TTS_SPEED, split_pattern=r"\n+"
+            text,
+            voice=self.voices[voice or config.TTS_VOICE],
+            speed=config.TTS_SPEED,
+            split_pattern=r"\n+",
         )
 
         speech_segments = []
@@ -41,3 +67,17 @@ class LocalSynthesizer(SynthesizerBase):
         )
 
         return speech_output
+
+    def warm_up(self):
+        """Synthesize a representative phrase with every preloaded voice."""
+        for voice in self.voices:
+            self.generate_audio(config.WARM_UP_PHRASE, voice)
+
+    def cache_stats(self):
+        """
+        Get the G2P cache counters.
+
+        Returns:
+            dict: Cache counters
+        """
+        return {"g2p": self.g2p_cache.stats()}
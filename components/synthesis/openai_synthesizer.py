@@ -5,6 +5,7 @@ OpenAI speech synthesis module using OpenAI TTS API.
 import soundfile as sf
 from openai import OpenAI
 import config
+from components.single_flight import coalesced, normalize_text
 from components.synthesis.synthesizer_base import SynthesizerBase
 
 
@@ -13,22 +14,28 @@ class OpenAISynthesizer(SynthesizerBase):
 
     def __init__(self):
         """Initialize the OpenAI client."""
+        super().__init__()
         print(f"Using {config.OPENAI_TTS_MODEL} API...")
         self.client = OpenAI(api_key=config.OPENAI_API_KEY)
+        self.voices = {voice: voice for voice in config.OPENAI_TTS_VOICES}
 
-    def generate_audio(self, text):
+    @coalesced(lambda text, voice=None: (normalize_text(text), voice))
+    def generate_audio(self, text, voice=None):
         """
         Convert text to speech using OpenAI TTS API.
 
         Args:
             text (str): The text to convert to speech
+            voice (str, optional): One of the available voices, defaults to config.OPENAI_TTS_VOICE
 
         Returns:
             numpy.ndarray: The audio data
         """
         # Generate speech
         response = self.client.audio.speech.create(
-            model=config.OPENAI_TTS_MODEL, voice=config.OPENAI_TTS_VOICE, input=text
+            model=config.OPENAI_TTS_MODEL,
+            voice=self.voices[voice or config.OPENAI_TTS_VOICE],
+            input=text,
         )
 
         # Save the audio to a temporary file
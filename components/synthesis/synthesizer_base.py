@@ -9,19 +9,46 @@ import sounddevice as sd
 class SynthesizerBase(ABC):
     """Abstract base class for text-to-speech conversion."""
 
+    def __init__(self):
+        """Initialize the synthesizer."""
+        self.voices = {}
+
     @abstractmethod
-    def generate_audio(self, text):
+    def generate_audio(self, text, voice=None):
         """
         Convert text to speech.
 
         Args:
             text (str): The text to speak
+            voice (str, optional): One of the available voices, defaults to the configured voice
 
         Returns:
             numpy.ndarray: The audio data
         """
         pass
 
+    def list_voices(self):
+        """
+        List the voices that can be used without loading anything.
+
+        Returns:
+            list of str: The voice names
+        """
+        return list(self.voices)
+
+    def cache_stats(self):
+        """
+        Get the counters of the synthesis caches.
+
+        Returns:
+            dict: Cache counters by cache name
+        """
+        return {}
+
+    def warm_up(self):
+        """Run a representative request so that the first real one is not slower."""
+        pass
+
     def speak(self, audio_data):
         """
         Play the audio data.
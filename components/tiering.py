@@ -0,0 +1,73 @@
+"""
+Load-based routing of requests between model tiers.
+"""
+
+import threading
+import config
+
+# Routers of the tiered components, by component name
+routers = {}
+
+
+class TierRouter:
+    """Class for picking a model tier per request and recording the choices."""
+
+    def __init__(self, name, tiers, load=None):
+        """
+        Initialize the router.
+
+        Args:
+            name (str): The name of the routed component, used in metrics
+            tiers (list of str): Tier names ordered from the smallest to the largest model
+            load (callable, optional): Returns the current number of queued or running requests
+        """
+        self.tiers = tiers
+        self.load = load
+        self.lock = threading.Lock()
+        self.choices = {}
+        routers[name] = self
+
+    def choose(self, task, preferred, penalty=0):
+        """
+        Pick a tier for a request.
+
+        The preferred tier is lowered by one step for every TIER_LOAD_STEP requests
+        in flight and by the given penalty.
+
+        Args:
+            task (str): The type of request, used in metrics
+            preferred (int): Index of the tier to use when the component is idle
+            penalty (int, optional): Additional number of steps down
+
+        Returns:
+            int: Index of the chosen tier
+        """
+        load = self.load() if self.load else 0
+        index = preferred - load // config.TIER_LOAD_STEP - penalty
+        index = min(max(index, 0), len(self.tiers) - 1)
+
+        with self.lock:
+            task_choices = self.choices.setdefault(task, {})
+            tier = self.tiers[index]
+            task_choices[tier] = task_choices.get(tier, 0) + 1
+        return index
+
+    def stats(self):
+        """
+        Get the number of requests routed to each tier.
+
+        Returns:
+            dict: Counts by task and tier name
+        """
+        with self.lock:
+            return {task: dict(counts) for task, counts in self.choices.items()}
+
+
+def stats():
+    """
+    Get the tier choices of every router.
+
+    Returns:
+        dict: Tier choices by component name
+    """
+    return {name: router.stats() for name, router in routers.items()}
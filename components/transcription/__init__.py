@@ -4,19 +4,25 @@ Transcription factory module.
 
 from components.transcription.local_transcriber import LocalTranscriber
 from components.transcription.openai_transcriber import OpenAITranscriber
+from components.transcription.tiered_transcriber import TieredTranscriber
+import config
 
 
-def get_transcriber(model_provider="local"):
+def get_transcriber(model_provider="local", load=None):
     """
     Factory function to get the appropriate transcriber.
 
     Args:
         model_provider (str): The model provider to use.
+        load (callable, optional): Returns the current transcription load, used to pick
+            a model tier when config.MODEL_TIERING is enabled.
 
     Returns:
         TranscriberBase: An instance of a transcriber.
     """
     if model_provider == "openai":
         return OpenAITranscriber()
+    elif config.MODEL_TIERING:
+        return TieredTranscriber(config.LOCAL_STT_TIERS, load)
     else:
         return LocalTranscriber()
@@ -2,19 +2,30 @@
 Local speech transcription module using Whisper.
 """
 
+import numpy as np
 import whisper_timestamped as whisper
 import config
+from components.transcription.pronunciation import score_words, score_utterance
 from components.transcription.transcriber_base import TranscriberBase
 
+# Sample rate of the audio returned by whisper.load_audio
+SAMPLE_RATE = 16000
+
 
 class LocalTranscriber(TranscriberBase):
     """Class for transcribing speech to text using local Whisper model."""
 
-    def __init__(self):
-        """Initialize the local Whisper model."""
+    def __init__(self, model_size=None):
+        """
+        Initialize the local Whisper model.
+
+        Args:
+            model_size (str, optional): The Whisper model size, defaults to config.LOCAL_STT_SIZE
+        """
         super().__init__()
-        print("Loading local Whisper model...")
-        self.model = whisper.load_model(config.LOCAL_STT_SIZE)
+        self.model_size = model_size or config.LOCAL_STT_SIZE
+        print(f"Loading local Whisper model: {self.model_size}...")
+        self.model = whisper.load_model(self.model_size)
         self.transcription = None
         self.words = None
 
@@ -28,13 +39,29 @@ class LocalTranscriber(TranscriberBase):
         Returns:
             str: The transcribed text
         """
-        audio = whisper.load_audio(audio_file)
+        return self.transcribe_audio(whisper.load_audio(audio_file))
+
+    def transcribe_audio(self, audio):
+        """
+        Transcribe audio samples to text using local Whisper.
+
+        Args:
+            audio (numpy.ndarray): Mono audio samples at 16 kHz
+
+        Returns:
+            str: The transcribed text
+        """
         self.transcription = whisper.transcribe(self.model, audio, language="en")
         return self.transcription["text"]
 
+    def warm_up(self):
+        """Transcribe one second of silence to initialize the model."""
+        self.transcribe_audio(np.zeros(SAMPLE_RATE, dtype=np.float32))
+        self.transcription = None
+
     def extract_words(self):
         """
-        Extract words with their confidence scores and timing information.
+        Extract words with their confidence scores, pronunciation scores and timing information.
 
         Returns:
             list of dict: List of words with their confidence scores and positions
@@ -57,4 +84,10 @@ class LocalTranscriber(TranscriberBase):
                 )
                 position += 1
 
+        # Score all words of the utterance at once
+        scores = score_words(self.words)
+        for word, score in zip(self.words, scores):
+            word["pronunciation_score"] = round(float(score), 3)
+        self.pronunciation_score = score_utterance(scores)
+
         return self.words
@@ -54,6 +54,7 @@ class OpenAITranscriber(TranscriberBase):
                     "word": word["word"],
                     "confidence": 1,  # confidence is not available using this model
                     "is_low_confidence": False,
+                    "pronunciation_score": None,  # requires word confidences
                     "position": position,
                     "start": word["start"],
                     "end": word["end"],
@@ -0,0 +1,69 @@
+"""
+Pronunciation scoring from Whisper word confidences.
+"""
+
+import numpy as np
+import config
+
+# Smallest confidence used before taking the log, to avoid -inf scores
+MIN_CONFIDENCE = 1e-6
+
+# Characters ignored when measuring the length of a word
+PUNCTUATION = " .,!?;:\"'()-"
+
+
+def score_words(words):
+    """
+    Compute a pronunciation score for every word of an utterance at once.
+
+    The score starts from the word log-probability (Whisper word confidence is the
+    geometric mean of its token probabilities) and is lowered for words that were
+    stretched much longer than the speaker's usual pace, which usually signals
+    hesitation or a struggle with the word. Every word is allowed a minimum
+    duration, so that short words such as "I" or "a" are not seen as stretched.
+
+    Args:
+        words (list of dict): Words with 'word', 'confidence', 'start' and 'end' keys
+
+    Returns:
+        numpy.ndarray: One score between 0 and 1 per word
+    """
+    if not words:
+        return np.zeros(0, dtype=np.float32)
+
+    confidences = np.array([word["confidence"] for word in words], dtype=np.float32)
+    log_probs = np.log(np.clip(confidences, MIN_CONFIDENCE, 1.0))
+
+    # Expected duration from the speaker's pace in seconds per letter
+    letters = np.array(
+        [max(len(word["word"].strip(PUNCTUATION)), 1) for word in words],
+        dtype=np.float32,
+    )
+    durations = np.array(
+        [max(word["end"] - word["start"], 0.0) for word in words], dtype=np.float32
+    )
+    pace = durations / letters
+    long_words = letters >= 3
+    reference_pace = np.median(pace[long_words] if long_words.any() else pace)
+    expected = np.maximum(
+        letters * reference_pace, config.PRONUNCIATION_MIN_WORD_DURATION
+    )
+    stretch = durations / expected
+    excess_stretch = np.clip(stretch - config.PRONUNCIATION_MAX_STRETCH, 0.0, None)
+
+    return np.exp(log_probs - config.PRONUNCIATION_STRETCH_PENALTY * excess_stretch)
+
+
+def score_utterance(scores):
+    """
+    Combine word scores into a single score for the utterance.
+
+    Args:
+        scores (numpy.ndarray): Word scores returned by score_words
+
+    Returns:
+        float: The geometric mean of the word scores, or None if there are no words
+    """
+    if len(scores) == 0:
+        return None
+    return float(np.exp(np.mean(np.log(np.clip(scores, MIN_CONFIDENCE, 1.0)))))
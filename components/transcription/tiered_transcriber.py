@@ -0,0 +1,63 @@
+"""
+Local speech transcription routed between several Whisper model sizes.
+"""
+
+import whisper_timestamped as whisper
+import config
+from components.tiering import TierRouter
+from components.transcription.local_transcriber import LocalTranscriber, SAMPLE_RATE
+from components.transcription.transcriber_base import TranscriberBase
+
+
+class TieredTranscriber(TranscriberBase):
+    """Class for transcribing speech with a Whisper size picked per request."""
+
+    def __init__(self, model_sizes, load=None):
+        """
+        Load every Whisper model size.
+
+        Args:
+            model_sizes (list of str): Whisper sizes ordered from the smallest to the largest
+            load (callable, optional): Returns the current transcription load
+        """
+        super().__init__()
+        self.transcribers = [LocalTranscriber(size) for size in model_sizes]
+        self.router = TierRouter("transcription", model_sizes, load)
+        self.transcriber = self.transcribers[-1]
+
+    def transcribe(self, audio_file):
+        """
+        Transcribe an audio file with the Whisper size suited to the current load.
+
+        Long utterances are sent one size down since their cost grows with their length.
+
+        Args:
+            audio_file (str): Path to the audio file
+
+        Returns:
+            str: The transcribed text
+        """
+        audio = whisper.load_audio(audio_file)
+        duration = len(audio) / SAMPLE_RATE
+        penalty = 1 if duration > config.TIER_LONG_UTTERANCE_SECONDS else 0
+        index = self.router.choose(
+            "transcription", len(self.transcribers) - 1, penalty
+        )
+        self.transcriber = self.transcribers[index]
+        return self.transcriber.transcribe_audio(audio)
+
+    def warm_up(self):
+        """Warm up every Whisper model size."""
+        for transcriber in self.transcribers:
+            transcriber.warm_up()
+
+    def extract_words(self):
+        """
+        Extract words from the last transcription.
+
+        Returns:
+            list of dict: List of words with their confidence scores and positions
+        """
+        self.words = self.transcriber.extract_words()
+        self.pronunciation_score = self.transcriber.pronunciation_score
+        return self.words
@@ -11,6 +11,7 @@ class TranscriberBase(ABC):
     def __init__(self):
         """Initialize the transcriber."""
         self.words = None
+        self.pronunciation_score = None
 
     @abstractmethod
     def transcribe(self, audio_file):
@@ -25,6 +26,10 @@ class TranscriberBase(ABC):
         """
         pass
 
+    def warm_up(self):
+        """Run a representative request so that the first real one is not slower."""
+        pass
+
     @abstractmethod
     def extract_words(self, transcription):
         """
@@ -12,10 +12,25 @@ dotenv.load_dotenv()
 # Model provider
 MODEL_PROVIDER = os.getenv("MODEL_PROVIDER", "local")
 
+# Learner history settings
+DATABASE_PATH = os.getenv("DATABASE_PATH", "english_buddy.db")
+DEFAULT_LEARNER_ID = "default"
+HISTORY_TURNS = 20  # recent turns of a learner sent to the model as context
+RECENT_MISTAKES_LIMIT = 10
+STORE_BATCH_SIZE = 100  # maximum writes committed in one transaction
+STORE_FLUSH_INTERVAL = 0.5  # seconds to wait for more writes before committing
+
 # Local model settings
 MODEL_ID = "meta-llama/Llama-3.2-3B-Instruct"
 LOCAL_STT_SIZE = "base"  # "small", "tiny", "base"
 
+# Model tiering settings, routing each request to a model size by load
+MODEL_TIERING = os.getenv("MODEL_TIERING", "false").lower() == "true"
+LOCAL_STT_TIERS = ["tiny", "base", "small"]  # from the smallest to the largest
+MODEL_TIERS = ["meta-llama/Llama-3.2-1B-Instruct", MODEL_ID]
+TIER_LOAD_STEP = 2  # requests in flight per step down to a smaller tier
+TIER_LONG_UTTERANCE_SECONDS = 15  # longer utterances go one tier down
+
 # OpenAI settings
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 OPENAI_STT_MODEL = "whisper-1"
@@ -33,8 +48,18 @@ DEVICE = (
 
 # TTS settings
 TTS_VOICE = "af_heart"
+TTS_VOICES = [TTS_VOICE, "af_bella", "am_michael"]  # preloaded at startup
 OPENAI_TTS_VOICE = "shimmer"
+OPENAI_TTS_VOICES = [OPENAI_TTS_VOICE, "alloy", "echo"]
 TTS_SPEED = 1.0
+G2P_TEXT_CACHE_SIZE = 1024  # texts whose conversion is kept in memory
+G2P_CACHE_SIZE = 20000  # out-of-lexicon tokens whose phonemes are kept in memory and on disk
+G2P_LEXICON_PATH = "g2p_lexicon.json"  # reloaded at startup
+G2P_SAVE_EVERY = 50  # new tokens converted before the lexicon is saved again
+
+# Warm-up settings, run every model once at startup
+WARM_UP = os.getenv("WARM_UP", "true").lower() == "true"
+WARM_UP_PHRASE = "Hello! How was your day?"
 
 # System prompt for AI assistant
 SYSTEM_PROMPT = """You are a friendly AI assistant having a casual spoken conversation with the user in English. Main goals:
@@ -51,10 +76,39 @@ REPHRASING_PROMPT = """
 You are a helpful assistant for English learners. Assess if the user's text needs grammatical improvement. If it does, provide a corrected version that sounds more natural. If it's already grammatically correct and natural, indicate that no rephrasing is needed. Respond in a JSON format with two fields: "needs_rephrasing" (boolean) and "rephrased_text" (string, only include if rephrasing is needed).
 """
 
+# Grammar pre-check settings
+GRAMMAR_CHECK_MAX_WORDS = 8  # longer sentences always go to the model
+GRAMMAR_CHECK_MIN_AUDITS = 50  # audited sentences needed before skipping the model
+GRAMMAR_CHECK_MIN_ACCURACY = 0.98  # agreement with the model needed to skip it
+GRAMMAR_CHECK_AUDIT_RATE = 0.1  # share of clean sentences still checked by the model
+
+# Scheduler settings
+SCHEDULER_STAGES = {
+    "transcription": {"concurrency": 1, "queue_size": 4},
+    "generation": {"concurrency": 1, "queue_size": 8},
+    "synthesis": {"concurrency": 1, "queue_size": 8},
+    "playback": {"concurrency": 1, "queue_size": 1},
+}
+SCHEDULER_DEADLINES = {  # maximum waiting time in seconds, by priority class
+    0: 30,  # interactive
+    1: 10,  # background
+}
+
 # Generation settings
 MAX_NEW_TOKENS = 256
 TEMPERATURE = 0.7
 TOP_P = 0.9
 
+# Batch processing settings
+BATCH_SIZE = 8  # texts per batched generation call
+BATCH_WORKERS = 2  # transcription processes
+AUDIO_EXTENSIONS = [".wav", ".mp3", ".m4a", ".flac", ".ogg", ".webm"]
+
 # Confidence threshold for determining low confidence words
 CONFIDENCE_THRESHOLD = 0.5
+
+# Pronunciation scoring settings
+PRONUNCIATION_MAX_STRETCH = 2.0  # word duration allowed relative to its expected duration
+PRONUNCIATION_STRETCH_PENALTY = 0.5  # log-score penalty per unit of extra stretch
+PRONUNCIATION_MIN_WORD_DURATION = 0.3  # seconds any word may take without penalty
+PRONUNCIATION_SCORE_THRESHOLD = 0.5  # words scored lower are pointed out to the assistant
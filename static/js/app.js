@@ -26,6 +26,9 @@ document.addEventListener('DOMContentLoaded', function() {
     let audioChunks = [];
     let isRecording = false;
     
+    // Error raised when the server asks to retry later
+    class BusyError extends Error {}
+    
     // Initialize the application
     initApp();
     
@@ -157,6 +160,10 @@ document.addEventListener('DOMContentLoaded', function() {
                 body: JSON.stringify({ audio: audioData })
             });
             
+            if (transcriptionResponse.status === 429) {
+                throw new BusyError();
+            }
+            
             if (!transcriptionResponse.ok) {
                 throw new Error('Server error during transcription');
             }
@@ -180,6 +187,10 @@ document.addEventListener('DOMContentLoaded', function() {
                 })
             });
             
+            if (responseResponse.status === 429) {
+                throw new BusyError();
+            }
+            
             if (!responseResponse.ok) {
                 throw new Error('Server error during response generation');
             }
@@ -194,7 +205,11 @@ document.addEventListener('DOMContentLoaded', function() {
             
         } catch (error) {
             console.error('Error processing speech:', error);
-            alert('Error processing your speech. Please try again.');
+            if (error instanceof BusyError) {
+                alert('The assistant is busy right now. Please try again in a few seconds.');
+            } else {
+                alert('Error processing your speech. Please try again.');
+            }
             resetButton();
         }
     }
@@ -215,6 +230,7 @@ document.addEventListener('DOMContentLoaded', function() {
             whisperWords[wordInfo.position] = {
                 word: wordInfo.word,
                 is_low_confidence: wordInfo.is_low_confidence,
+                pronunciation_score: wordInfo.pronunciation_score,
                 position: wordInfo.position
             };
         });
@@ -244,7 +260,7 @@ document.addEventListener('DOMContentLoaded', function() {
                     if (whisperWords[wordIndex]) {
                         const wordInfo = whisperWords[wordIndex];
                         const spanClass = wordInfo.is_low_confidence ? 'user-word red-text' : 'user-word';
-                        htmlText += `<span class="${spanClass}" data-position="${wordInfo.position}">${wordBuffer}</span>`;
+                        htmlText += `<span class="${spanClass}" data-position="${wordInfo.position}"${scoreTitle(wordInfo)}>${wordBuffer}</span>`;
                     } else {
                         htmlText += `<span class="user-word" data-position="${wordIndex}">${wordBuffer}</span>`;
                     }
@@ -263,7 +279,7 @@ document.addEventListener('DOMContentLoaded', function() {
             if (whisperWords[wordIndex]) {
                 const wordInfo = whisperWords[wordIndex];
                 const spanClass = wordInfo.is_low_confidence ? 'user-word red-text' : 'user-word';
-                htmlText += `<span class="${spanClass}" data-position="${wordInfo.position}">${wordBuffer}</span>`;
+                htmlText += `<span class="${spanClass}" data-position="${wordInfo.position}"${scoreTitle(wordInfo)}>${wordBuffer}</span>`;
             } else {
                 htmlText += `<span class="user-word" data-position="${wordIndex}">${wordBuffer}</span>`;
             }
@@ -280,6 +296,14 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    function scoreTitle(wordInfo) {
+        // Show the pronunciation score as a tooltip when it is available
+        if (wordInfo.pronunciation_score === null || wordInfo.pronunciation_score === undefined) {
+            return '';
+        }
+        return ` title="Pronunciation: ${Math.round(wordInfo.pronunciation_score * 100)}%"`;
+    }
+    
     function displayAssistantResponse(text) {
         if (!text) return;
         